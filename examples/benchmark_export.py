@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.calendar.ics_generator import ICSGenerator, EventData
+
+def build_generator(count: int) -> ICSGenerator:
+    """Build a calendar with synthetic events"""
+    generator = ICSGenerator()
+    start = datetime(2025, 1, 1, 9, 0)
+    for i in range(count):
+        event_start = start + timedelta(hours=i)
+        generator.add_event(EventData(
+            summary=f"Meeting {i}",
+            start_time=event_start,
+            end_time=event_start + timedelta(hours=1),
+            location="3楼会议室",
+            description="议程：\n1. 项目背景介绍\n2. 技术方案讨论\n3. 时间节点确认",
+            attendees=["zhang@example.com", "li@example.com"],
+        ))
+    return generator
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    generator = build_generator(count)
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+
+    print(f"Exporting {count} events on {cores} cores\n")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for workers in worker_counts:
+            filename = os.path.join(tmpdir, f"calendar_{workers}.ics")
+            started = time.perf_counter()
+            generator.save(filename, workers=workers)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import time
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp.prefilter import is_event_text, load_corpus, evaluate
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'tests', 'data', 'prefilter_corpus.tsv')
+
+def main():
+    corpus = load_corpus(CORPUS_PATH)
+    precision, recall, errors = evaluate(corpus)
+    for is_event, text in errors:
+        print(f"{'false negative' if is_event else 'false positive'}: {text}")
+
+    print(f"Corpus size: {len(corpus)}")
+    print(f"Precision: {precision:.3f}")
+    print(f"Recall: {recall:.3f}")
+
+    rounds = 200
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for _, text in corpus:
+            is_event_text(text)
+    elapsed = time.perf_counter() - started
+    print(f"Average time per input: {elapsed / (rounds * len(corpus)) * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    main()
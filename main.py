@@ -7,11 +7,29 @@ from kivy.core.window import Window
 from kivy.clock import Clock
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from src.nlp.text_parser import TextParser
+from src.nlp.prefilter import is_event_text
 from src.calendar.ics_generator import ICSGenerator
 
+# Seconds of typing pause before a speculative parse starts
+SPECULATIVE_DELAY = 0.8
+
 class CalendarApp(App):
     def build(self):
+        # Speculative parsing state
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Generate gets its own worker so superseded speculation cannot delay it
+        self._generate_executor = ThreadPoolExecutor(max_workers=1)
+        self._parser_settings = None
+        self._parsers = {}
+        self._parsers_lock = threading.Lock()
+        self._debounce_event = None
+        self._speculative_key = None
+        self._speculative_future = None
+        self._generate_future = None
+        
         # Set up the main layout
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
@@ -62,6 +80,10 @@ class CalendarApp(App):
         )
         self.generate_button.bind(on_press=self.generate_calendar)
         
+        # Parse in the background once typing pauses; settings changes are not
+        # speculated on, so a half-typed key or URL is never used
+        self.event_input.bind(text=self.on_input_changed)
+        
         # Status label
         self.status_label = Label(
             text='Ready',
@@ -78,36 +100,107 @@ class CalendarApp(App):
         
         return layout
     
+    def on_stop(self):
+        self._executor.shutdown(wait=False)
+        self._generate_executor.shutdown(wait=False)
+    
+    def _current_key(self):
+        """Key a parse by the exact text and settings"""
+        return (
+            self.event_input.text.strip(),
+            self.api_key_input.text,
+            self.base_url_input.text,
+            self.model_input.text
+        )
+    
+    def _get_parser(self, api_key, base_url, model, speculative=False):
+        """Reuse the parsers for the current settings, dropping those for older ones"""
+        with self._parsers_lock:
+            settings = (api_key, base_url, model)
+            if settings != self._parser_settings:
+                self._parser_settings = settings
+                self._parsers = {}
+            if speculative not in self._parsers:
+                # Speculative parses fail fast instead of retrying stale input
+                self._parsers[speculative] = TextParser(
+                    api_key=api_key,
+                    base_url=base_url,
+                    model=model,
+                    max_retries=0 if speculative else 3
+                )
+            return self._parsers[speculative]
+    
+    def _parse(self, key, speculative=False):
+        """Parse event text in a worker thread"""
+        event_text, api_key, base_url, model = key
+        parser = self._get_parser(api_key, base_url, model, speculative)
+        return parser.parse_to_event_data(event_text)
+    
+    def on_input_changed(self, instance, value):
+        """Restart the debounce timer whenever the event text changes"""
+        if self._debounce_event is not None:
+            self._debounce_event.cancel()
+        self._debounce_event = Clock.schedule_once(self.start_speculative_parse, SPECULATIVE_DELAY)
+    
+    def start_speculative_parse(self, dt):
+        """Parse the current text in the background, superseding older speculation"""
+        key = self._current_key()
+        if key == self._speculative_key:
+            return
+        
+        # The previous result no longer matches; cancel it if it has not started,
+        # unless Generate is waiting on it
+        future = self._speculative_future
+        if future is not None and future is not self._generate_future:
+            future.cancel()
+        self._speculative_key = None
+        self._speculative_future = None
+        
+        event_text, api_key = key[0], key[1]
+        if not api_key or not is_event_text(event_text):
+            return
+        self._speculative_key = key
+        self._speculative_future = self._executor.submit(self._parse, key, True)
+    
     def generate_calendar(self, instance):
         # Disable button and show loading state
         self.generate_button.disabled = True
         self.status_label.text = 'Processing...'
         
         # Get input values
-        api_key = self.api_key_input.text
-        event_text = self.event_input.text
+        key = self._current_key()
+        event_text, api_key = key[0], key[1]
         
         if not api_key or not event_text:
             self.status_label.text = 'Please enter both API key and event description'
             self.generate_button.disabled = False
             return
         
-        # Schedule the actual processing to avoid blocking the UI
-        Clock.schedule_once(lambda dt: self.process_calendar(api_key, event_text))
+        # Reuse the speculative parse when it was made for exactly this input and
+        # has already started; a queued one would wait behind superseded work
+        future = self._speculative_future
+        if key != self._speculative_key or future is None:
+            future = None
+        elif future.cancel():  # still queued (or already cancelled)
+            future = None
+        elif future.done() and future.exception() is not None:
+            future = None
+        if future is None:
+            future = self._generate_executor.submit(self._parse, key)
+            self._speculative_key = key
+            self._speculative_future = future
+        self._generate_future = future
+        
+        # Finish on the UI thread once parsing is done
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self.process_calendar(f))
+        )
     
-    def process_calendar(self, api_key, event_text):
+    def process_calendar(self, future):
         try:
-            # Initialize parser and generator
-            parser = TextParser(
-                api_key=api_key,
-                base_url=self.base_url_input.text,
-                model=self.model_input.text
-            )
+            event = future.result()
             generator = ICSGenerator()
             
-            # Parse event text
-            event = parser.parse_to_event_data(event_text)
-            
             # Generate ICS file
             if android:
                 # For Android, save to app-specific storage
@@ -125,6 +218,7 @@ class CalendarApp(App):
         except Exception as e:
             self.status_label.text = f'Error: {str(e)}'
         finally:
+            self._generate_future = None
             self.generate_button.disabled = False
 
 if __name__ == '__main__':
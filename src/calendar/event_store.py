@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sqlite3
+import uuid
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+from src.calendar.ics_generator import EventData, ICSGenerator
+from src.calendar.timezones import get_offsets, get_zone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL UNIQUE,
+    summary TEXT NOT NULL,
+    start_utc INTEGER NOT NULL,
+    end_utc INTEGER NOT NULL,
+    location TEXT,
+    description TEXT,
+    attendees TEXT,
+    reminder_minutes INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events (start_utc);
+CREATE INDEX IF NOT EXISTS idx_events_end ON events (end_utc);
+"""
+
+# Trigram full-text index so that Chinese text matches on substrings (SQLite >= 3.34)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    summary, location, description, content='events', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts (rowid, summary, location, description)
+    VALUES (new.id, new.summary, new.location, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts (events_fts, rowid, summary, location, description)
+    VALUES ('delete', old.id, old.summary, old.location, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS events_au AFTER UPDATE ON events BEGIN
+    INSERT INTO events_fts (events_fts, rowid, summary, location, description)
+    VALUES ('delete', old.id, old.summary, old.location, old.description);
+    INSERT INTO events_fts (rowid, summary, location, description)
+    VALUES (new.id, new.summary, new.location, new.description);
+END;
+"""
+
+COLUMNS = 'uid, summary, start_utc, end_utc, location, description, attendees, reminder_minutes'
+
+class EventStore:
+    """Persistent SQLite store of calendar events with date-range and text queries"""
+
+    def __init__(self, path: str = 'my_calendar.db', timezone: str = 'Asia/Shanghai'):
+        """Open (or create) the store
+
+        Args:
+            path (str, optional): SQLite database file. Defaults to 'my_calendar.db'.
+            timezone (str, optional): Timezone of naive datetimes passed in and returned.
+                Defaults to 'Asia/Shanghai'.
+        """
+        self.path = path
+        self.tzid = timezone
+        self.timezone = get_zone(timezone)
+        self._offsets = get_offsets(timezone)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:  # FTS5 or trigram tokenizer unavailable
+            self.has_fts = False
+        self.connection.commit()
+
+    def _to_epoch(self, value: datetime) -> int:
+        """Convert a naive local or aware datetime to UTC epoch seconds"""
+        if value.tzinfo is None:
+            value = self._offsets.to_utc(value)
+        return int(value.timestamp())
+
+    def _from_epoch(self, value: int) -> datetime:
+        """Convert UTC epoch seconds to a naive local datetime"""
+        return datetime.fromtimestamp(value, self.timezone).replace(tzinfo=None)
+
+    def _upsert(self, event_data: EventData) -> str:
+        """Insert or update an event without committing"""
+        uid = event_data.uid or f'{uuid.uuid4()}@aicalendar.example.com'
+        self.connection.execute(
+            f"""INSERT INTO events ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (uid) DO UPDATE SET
+                    summary = excluded.summary, start_utc = excluded.start_utc,
+                    end_utc = excluded.end_utc, location = excluded.location,
+                    description = excluded.description, attendees = excluded.attendees,
+                    reminder_minutes = excluded.reminder_minutes""",
+            (
+                uid,
+                event_data.summary,
+                self._to_epoch(event_data.start_time),
+                self._to_epoch(event_data.end_time),
+                event_data.location,
+                event_data.description,
+                json.dumps(event_data.attendees or [], ensure_ascii=False),
+                event_data.reminder_minutes,
+            )
+        )
+        return uid
+
+    def add_event(self, event_data: EventData) -> str:
+        """Insert or update an event and return its UID"""
+        with self.connection:
+            return self._upsert(event_data)
+
+    def add_events(self, events_data: List[EventData]) -> List[str]:
+        """Insert or update multiple events in one transaction"""
+        with self.connection:
+            return [self._upsert(event_data) for event_data in events_data]
+
+    def delete_event(self, uid: str) -> bool:
+        """Delete an event by UID, returning whether it existed"""
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM events WHERE uid = ?", (uid,))
+        return cursor.rowcount > 0
+
+    def _where(self, start: Optional[datetime], end: Optional[datetime],
+               text: Optional[str]) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause shared by query, count and export"""
+        clauses, params = [], []
+        # Events overlapping [start, end)
+        if start is not None:
+            clauses.append("end_utc > ?")
+            params.append(self._to_epoch(start))
+        if end is not None:
+            clauses.append("start_utc < ?")
+            params.append(self._to_epoch(end))
+        if text:
+            if self.has_fts and len(text) >= 3:
+                clauses.append("id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)")
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                clauses.append("(summary LIKE ? ESCAPE '\\' OR location LIKE ? ESCAPE '\\' "
+                               "OR description LIKE ? ESCAPE '\\')")
+                params.extend([pattern] * 3)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              text: Optional[str] = None, limit: Optional[int] = None) -> Iterator[EventData]:
+        """Yield events overlapping [start, end) and matching text, ordered by start time"""
+        where, params = self._where(start, end, text)
+        sql = f"SELECT {COLUMNS} FROM events{where} ORDER BY start_utc, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self.connection.execute(sql, params):
+            uid, summary, start_utc, end_utc, location, description, attendees, reminder = row
+            yield EventData(
+                summary=summary,
+                start_time=self._from_epoch(start_utc),
+                end_time=self._from_epoch(end_utc),
+                location=location,
+                description=description,
+                attendees=json.loads(attendees) if attendees else [],
+                reminder_minutes=reminder,
+                uid=uid
+            )
+
+    def count(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              text: Optional[str] = None) -> int:
+        """Count events matching a query"""
+        where, params = self._where(start, end, text)
+        return self.connection.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    def export(self, filename: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               text: Optional[str] = None, use_utc: bool = False) -> int:
+        """Stream matching events from the index into an ICS file and return how many were written"""
+        where, params = self._where(start, end, text)
+        first, last = self.connection.execute(
+            f"SELECT MIN(start_utc), MAX(end_utc) FROM events{where}", params
+        ).fetchone()
+        years = range(self._from_epoch(first).year, self._from_epoch(last).year + 1) if first else ()
+
+        generator = ICSGenerator(timezone=self.tzid, use_utc=use_utc)
+        written = 0
+
+        def counted() -> Iterator[EventData]:
+            nonlocal written
+            for event_data in self.query(start, end, text):
+                written += 1
+                yield event_data
+
+        with open(filename, 'wb') as f:
+            for chunk in generator.stream_ical(counted(), years):
+                f.write(chunk)
+        return written
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+
+    def __enter__(self) -> 'EventStore':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
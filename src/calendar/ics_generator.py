@@ -2,9 +2,13 @@
 
 from datetime import datetime, timedelta
 from icalendar import Calendar, Event, Alarm
-import pytz
-from typing import Optional, List, Dict, Union
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Union, Iterator, Iterable, TYPE_CHECKING
+from dataclasses import dataclass, replace
+from src.calendar.timezones import get_zone, get_offsets
+from src.calendar.sharded_export import CALENDAR_FOOTER, split_calendar, write_sharded
+
+if TYPE_CHECKING:
+    from src.calendar.event_store import EventStore
 
 @dataclass
 class EventData:
@@ -16,29 +20,51 @@ class EventData:
     description: Optional[str] = None
     attendees: Optional[List[str]] = None
     reminder_minutes: Optional[int] = 15
+    uid: Optional[str] = None
 
 class ICSGenerator:
     """ICS file generator for calendar events"""
     
-    def __init__(self, timezone: str = 'Asia/Shanghai'):
-        """Initialize the generator with specified timezone"""
-        self.timezone = pytz.timezone(timezone)
-        self.calendar = Calendar()
-        self.calendar.add('prodid', '-//AI Calendar Assistant//aicalendar.example.com//')
-        self.calendar.add('version', '2.0')
+    def __init__(self, timezone: str = 'Asia/Shanghai', use_utc: bool = False,
+                 store: Optional['EventStore'] = None):
+        """Initialize the generator with specified timezone
+        
+        Args:
+            timezone (str, optional): Timezone of the event times. Defaults to 'Asia/Shanghai'.
+            use_utc (bool, optional): Write all times as UTC instead of local time with
+                a TZID and VTIMEZONE. Defaults to False.
+            store (EventStore, optional): Also record every added event in this
+                persistent store. Defaults to None.
+        """
+        self.tzid = timezone
+        self.timezone = get_zone(timezone)
+        self.use_utc = use_utc
+        self._offsets = get_offsets(timezone)
+        self.store = store
+        self.clear()
+        
+    def _add_time(self, event: Event, name: str, value: datetime) -> None:
+        """Add a datetime property in the configured timezone"""
+        local_time = self._offsets.to_local(value)
+        if self.use_utc:
+            event.add(name, self._offsets.to_utc(local_time))
+        else:
+            # Naive local time plus TZID avoids a localize call per event
+            event.add(name, local_time, parameters={'TZID': self.tzid})
+            self._tz_years.add(local_time.year)
         
     def create_event(self, event_data: EventData) -> Event:
         """Create a calendar event from EventData"""
         event = Event()
         
         # Add basic info
+        if event_data.uid:
+            event.add('uid', event_data.uid)
         event.add('summary', event_data.summary)
         
         # Handle time
-        start_time = self.timezone.localize(event_data.start_time)
-        end_time = self.timezone.localize(event_data.end_time)
-        event.add('dtstart', start_time)
-        event.add('dtend', end_time)
+        self._add_time(event, 'dtstart', event_data.start_time)
+        self._add_time(event, 'dtend', event_data.end_time)
         
         # Add optional info
         if event_data.location:
@@ -63,21 +89,91 @@ class ICSGenerator:
     
     def add_event(self, event_data: EventData) -> None:
         """Add an event to the calendar"""
+        if self.store is not None:
+            # Hand the store aware UTC times so its own timezone cannot shift them
+            stored = replace(
+                event_data,
+                start_time=self._offsets.to_utc(self._offsets.to_local(event_data.start_time)),
+                end_time=self._offsets.to_utc(self._offsets.to_local(event_data.end_time))
+            )
+            event_data = replace(event_data, uid=self.store.add_event(stored))
         event = self.create_event(event_data)
         self.calendar.add_component(event)
+        self._events_data.append(event_data)
         
     def add_events(self, events_data: List[EventData]) -> None:
         """Add multiple events to the calendar"""
         for event_data in events_data:
             self.add_event(event_data)
             
-    def save(self, filename: str) -> None:
-        """Save the calendar to an ICS file"""
+    def _attach_timezone(self) -> None:
+        """Put a single up-to-date VTIMEZONE at the top of the calendar"""
+        components = [c for c in self.calendar.subcomponents if c.name != 'VTIMEZONE']
+        if self._tz_years:
+            components.insert(0, self._offsets.vtimezone(self._tz_years))
+        self.calendar.subcomponents = components
+            
+    def to_ical(self) -> bytes:
+        """Serialize the calendar to ICS bytes"""
+        self._attach_timezone()
+        return self.calendar.to_ical()
+            
+    def iter_ical(self) -> Iterator[bytes]:
+        """Serialize the calendar piece by piece for streaming"""
+        self._attach_timezone()
+        head, events = split_calendar(self.calendar)
+        yield head
+        for event in events:
+            yield event.to_ical()
+        yield CALENDAR_FOOTER
+            
+    def stream_ical(self, events_data: Iterable[EventData], years: Iterable[int] = ()) -> Iterator[bytes]:
+        """Serialize events one by one without adding them to the calendar
+        
+        The header is written before any event is seen, so years lists the
+        years the VTIMEZONE has to cover.
+        """
+        header = Calendar()
+        header.update(self.calendar)
+        if not self.use_utc:
+            header.add_component(self._offsets.vtimezone(years))
+        head, _ = split_calendar(header)
+        yield head
+        for event_data in events_data:
+            yield self.create_event(event_data).to_ical()
+        yield CALENDAR_FOOTER
+            
+    def save(self, filename: str, workers: int = 1, shard_size: int = 200) -> None:
+        """Save the calendar to an ICS file
+        
+        Args:
+            filename (str): Output file path
+            workers (int, optional): Build and serialize events in this many worker
+                processes (threads on free-threaded builds). Defaults to 1 (serial).
+            shard_size (int, optional): Events per worker task. Defaults to 200.
+        """
+        if workers <= 1 or len(self.calendar.subcomponents) <= shard_size:
+            with open(filename, 'wb') as f:
+                f.write(self.to_ical())
+            return
+            
+        self._attach_timezone()
+        head, events = split_calendar(self.calendar)
+        # Workers rebuild events from EventData, so components added to the
+        # calendar directly can only be written serially
+        if len(events) != len(self._events_data):
+            with open(filename, 'wb') as f:
+                f.write(self.calendar.to_ical())
+            return
+            
         with open(filename, 'wb') as f:
-            f.write(self.calendar.to_ical())
+            write_sharded(head, self._events_data, f, self.tzid, self.use_utc,
+                          workers=workers, shard_size=shard_size)
             
     def clear(self) -> None:
         """Clear all events from the calendar"""
         self.calendar = Calendar()
         self.calendar.add('prodid', '-//AI Calendar Assistant//aicalendar.example.com//')
-        self.calendar.add('version', '2.0') 
\ No newline at end of file
+        self.calendar.add('version', '2.0')
+        self._tz_years = set()
+        self._events_data = []
\ No newline at end of file
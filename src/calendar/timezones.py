@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_right
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+from icalendar import Timezone, TimezoneStandard, TimezoneDaylight
+import pytz
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9 falls back to pytz
+    ZoneInfo = None
+
+class Transition(NamedTuple):
+    """A single UTC offset change of a timezone"""
+    local_time: datetime   # wall clock time (in the old offset) at which the change happens
+    offset_from: timedelta
+    offset_to: timedelta
+    name: str
+    is_dst: bool
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> tzinfo:
+    """Return a cached tzinfo for the given name, preferring zoneinfo over pytz"""
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except (KeyError, ValueError):  # no tzdata available for this zone
+            pass
+    return pytz.timezone(name)
+
+class ZoneOffsets:
+    """UTC offsets of a timezone, memoized per DST period and year"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.zone = get_zone(name)
+        self._years: Dict[int, Tuple[List[datetime], List[timedelta], List[Transition]]] = {}
+
+    def _utc_state(self, utc_time: datetime) -> Tuple[timedelta, str, bool]:
+        """Return (offset, name, is_dst) in effect at a naive UTC time"""
+        local = pytz.utc.localize(utc_time).astimezone(self.zone)
+        return local.utcoffset(), local.tzname(), bool(local.dst())
+
+    def _find_change(self, lower: datetime, upper: datetime) -> datetime:
+        """Bisect the first minute in (lower, upper] with a different offset than lower"""
+        offset = self._utc_state(lower)[0]
+        while upper - lower > timedelta(minutes=1):
+            middle = lower + (upper - lower) / 2
+            middle = middle.replace(second=0, microsecond=0)
+            if middle <= lower:
+                middle = lower + timedelta(minutes=1)
+            if self._utc_state(middle)[0] == offset:
+                lower = middle
+            else:
+                upper = middle
+        return upper
+
+    def _load_year(self, year: int) -> Tuple[List[datetime], List[timedelta], List[Transition]]:
+        """Compute the DST periods of a year by scanning daily and bisecting changes"""
+        cached = self._years.get(year)
+        if cached is not None:
+            return cached
+
+        start = datetime(year, 1, 1)
+        offset = self._utc_state(start)[0]
+        boundaries, offsets, transitions = [], [offset], []
+
+        day = start
+        while day.year == year:
+            next_day = day + timedelta(days=1)
+            next_offset = self._utc_state(next_day)[0]
+            if next_offset != offset:
+                change = self._find_change(day, next_day)
+                _, name, is_dst = self._utc_state(change)
+                local_time = change + offset
+                # Wall times in a gap or overlap keep the old offset, like fold=0
+                boundaries.append(change + max(offset, next_offset))
+                offsets.append(next_offset)
+                transitions.append(Transition(local_time, offset, next_offset, name, is_dst))
+                offset = next_offset
+            day = next_day
+
+        self._years[year] = (boundaries, offsets, transitions)
+        return self._years[year]
+
+    def transitions(self, year: int) -> List[Transition]:
+        """Return the offset changes that happen during a year"""
+        return self._load_year(year)[2]
+
+    def utcoffset(self, local_time: datetime) -> timedelta:
+        """Return the UTC offset for a naive wall clock time"""
+        boundaries, offsets, _ = self._load_year(local_time.year)
+        return offsets[bisect_right(boundaries, local_time)]
+
+    def to_utc(self, local_time: datetime) -> datetime:
+        """Convert a naive wall clock time to an aware UTC datetime"""
+        return pytz.utc.localize(local_time - self.utcoffset(local_time))
+
+    def to_local(self, dt: datetime) -> datetime:
+        """Return dt as naive wall clock time, converting aware datetimes first"""
+        if dt.tzinfo is None:
+            return dt
+        return dt.astimezone(self.zone).replace(tzinfo=None)
+
+    def vtimezone(self, years: Iterable[int]) -> Timezone:
+        """Build a VTIMEZONE component covering the given years"""
+        years = sorted(set(years))
+        tz = Timezone()
+        tz.add('tzid', self.name)
+        if not years:
+            years = [datetime.now(self.zone).year]
+
+        # Period in effect at the start of the first year
+        start = datetime(years[0], 1, 1)
+        offset, name, is_dst = self._utc_state(start)
+        tz.add_component(self._period(start, offset, offset, name, is_dst))
+
+        for year in years:
+            for transition in self.transitions(year):
+                tz.add_component(self._period(*transition))
+        return tz
+
+    @staticmethod
+    def _period(local_time: datetime, offset_from: timedelta, offset_to: timedelta,
+                name: str, is_dst: bool):
+        """Build a STANDARD or DAYLIGHT sub-component"""
+        period = TimezoneDaylight() if is_dst else TimezoneStandard()
+        period.add('dtstart', local_time)
+        period.add('tzoffsetfrom', offset_from)
+        period.add('tzoffsetto', offset_to)
+        if name:
+            period.add('tzname', name)
+        return period
+
+@lru_cache(maxsize=None)
+def get_offsets(name: str) -> ZoneOffsets:
+    """Return the shared ZoneOffsets cache for a timezone name"""
+    return ZoneOffsets(name)
@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.nlp.text_parser import TextParser
 from src.calendar.ics_generator import ICSGenerator
+from src.calendar.event_store import EventStore
 
 def get_api_settings() -> dict:
     """获取用户的API设置"""
@@ -107,6 +108,7 @@ def get_event_texts() -> List[str]:
     return texts
 
 def main():
+    store = None
     try:
         # 获取API设置
         settings = get_api_settings()
@@ -122,7 +124,8 @@ def main():
             base_url=settings["base_url"],
             model=settings["model"]
         )
-        generator = ICSGenerator()
+        store = EventStore("my_calendar.db")
+        generator = ICSGenerator(store=store)
         
         # 处理每个日程
         for i, text in enumerate(texts, 1):
@@ -145,11 +148,15 @@ def main():
         output_file = "my_calendar.ics"
         generator.save(output_file)
         print(f"\n✓ 已生成日历文件: {output_file}")
+        print(f"✓ 历史日程已保存到: {store.path}（共 {store.count()} 个日程）")
         print("您可以将此文件导入到您的日历软件中（如 Google Calendar、Apple Calendar 等）")
         
     except Exception as e:
         print(f"\n程序出错: {str(e)}")
         sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
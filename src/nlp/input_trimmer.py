@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from src.nlp.prefilter import score_text
+
+# CJK characters are roughly one token each, other text roughly four characters per token
+CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+
+# Free-text sections that carry no scheduling information
+SECTION_HEADINGS = {
+    'ABSTRACT': ['abstract', 'talk abstract', 'summary of the talk', '报告摘要', '内容简介', '报告简介', '摘要'],
+    'BIO': ['speaker bio', 'short bio', 'biography', 'bio', 'about the speaker',
+            '报告人简介', '讲者简介', '嘉宾简介', '个人简介', '简介'],
+}
+
+# Headings that end a free-text section
+OTHER_HEADINGS = [
+    'time', 'date', 'when', 'location', 'venue', 'where', 'place', 'room', 'host', 'speaker',
+    'title', 'agenda', 'zoom', 'meeting link', 'join via zoom', 'passcode', 'password',
+    '时间', '日期', '地点', '主持人', '主持', '报告人', '讲者', '题目', '议程', '会议链接', '腾讯会议', '密码',
+]
+# Compound Chinese headings such as 报告时间 so that the prefix is not read as section text
+OTHER_HEADINGS += [
+    prefix + name
+    for prefix in ['报告', '会议', '活动', '讲座', '开始', '结束', '具体']
+    for name in ['时间', '日期', '地点', '题目']
+]
+
+PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+# Line breaks and sentence ends, where a section may stop early
+SENTENCE_BREAK = re.compile(r'\n|(?<=[.!?])\s+|(?<=[。！？；])')
+
+URL_PATTERN = re.compile(r'https?://[^\s，。；、）)\]]+')
+
+def _heading_pattern() -> re.Pattern:
+    """Compile one regex matching any known heading followed by a colon"""
+    names = []
+    for label, headings in SECTION_HEADINGS.items():
+        names.extend((heading, label) for heading in headings)
+    names.extend((heading, '') for heading in OTHER_HEADINGS)
+    # Longest first so that "speaker bio" wins over "speaker"
+    names.sort(key=lambda item: len(item[0]), reverse=True)
+    alternatives = '|'.join(re.escape(heading) for heading, _ in names)
+    return re.compile(r'(?<![A-Za-z])(' + alternatives + r')\s*[:：]', re.IGNORECASE)
+
+HEADING_PATTERN = _heading_pattern()
+HEADING_LABELS = {
+    heading: label for label, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text without a tokenizer"""
+    if not text:
+        return 0
+    cjk = len(CJK_PATTERN.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+@dataclass
+class TrimmedText:
+    """Text sent to the model plus the sections replaced by placeholders"""
+    text: str
+    sections: Dict[str, str] = field(default_factory=dict)
+    headings: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.sections)
+
+class InputTrimmer:
+    """Replace long free-text sections and links with placeholders before calling the model"""
+
+    def __init__(self, min_section_tokens: int = 60):
+        """Initialize the trimmer
+
+        Args:
+            min_section_tokens (int, optional): Sections shorter than this are sent as is.
+                Defaults to 60.
+        """
+        self.min_section_tokens = min_section_tokens
+
+    def _find_sections(self, text: str) -> List[Tuple[str, str, int, int]]:
+        """Return (label, heading, start, end) of each free-text section body"""
+        matches = list(HEADING_PATTERN.finditer(text))
+        sections = []
+        for index, match in enumerate(matches):
+            label = HEADING_LABELS.get(match.group(1).lower())
+            if not label:
+                continue
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+            sections.append((label, match.group(0), match.end(), self._section_end(text, match.end(), end)))
+        return sections
+
+    @staticmethod
+    def _section_end(text: str, start: int, end: int) -> int:
+        """Stop a section before scheduling details that follow it
+
+        The section ends before the first later paragraph that mentions a date or
+        time, or before the first line or sentence with a clock time.
+        """
+        for paragraph_break in PARAGRAPH_BREAK.finditer(text, start, end):
+            following = PARAGRAPH_BREAK.search(text, paragraph_break.end(), end)
+            paragraph = text[paragraph_break.end():following.start() if following else end]
+            if {'time', 'date'} & set(score_text(paragraph).reasons):
+                end = paragraph_break.start()
+                break
+        sentence_start = start
+        breaks = [match.end() for match in SENTENCE_BREAK.finditer(text, start, end)]
+        for sentence_end in breaks + [end]:
+            if 'time' in score_text(text[sentence_start:sentence_end]).reasons:
+                return sentence_start
+            sentence_start = sentence_end
+        return end
+
+    def trim(self, text: str, min_section_tokens: Optional[int] = None) -> TrimmedText:
+        """Replace long sections and links in text with placeholders"""
+        if min_section_tokens is None:
+            min_section_tokens = self.min_section_tokens
+        result = TrimmedText(text=text)
+        counters: Dict[str, int] = {}
+
+        def placeholder(label: str, body: str, heading: str = '') -> str:
+            counters[label] = counters.get(label, 0) + 1
+            key = f'[[{label}_{counters[label]}]]'
+            result.sections[key] = body
+            result.headings[key] = heading
+            return key
+
+        parts = []
+        position = 0
+        for label, heading, start, end in self._find_sections(text):
+            chunk = text[start:end]
+            body = chunk.strip()
+            if estimate_tokens(body) < min_section_tokens:
+                continue
+            # Keep the whitespace around the body so line structure survives
+            leading = chunk[:len(chunk) - len(chunk.lstrip())]
+            trailing = chunk[len(chunk.rstrip()):]
+            parts.append(text[position:start])
+            parts.append(leading + placeholder(label, body, heading) + trailing)
+            position = end
+        parts.append(text[position:])
+
+        result.text = URL_PATTERN.sub(lambda m: placeholder('LINK', m.group(0)), ''.join(parts))
+        return result
+
+    @staticmethod
+    def expand(value: Optional[str], trimmed: TrimmedText) -> Optional[str]:
+        """Replace any placeholders in a field with the original text"""
+        if not value or not trimmed.trimmed:
+            return value
+        for key, body in trimmed.sections.items():
+            value = value.replace(key, body)
+        return value
+
+    @staticmethod
+    def restore(description: Optional[str], trimmed: TrimmedText) -> Optional[str]:
+        """Put the original sections back into a description returned by the model"""
+        if not trimmed.trimmed:
+            return description
+        description = description or ''
+        missing = []
+        for key, body in trimmed.sections.items():
+            if key in description:
+                description = description.replace(key, body)
+            else:
+                heading = trimmed.headings[key]
+                missing.append(f'{heading}\n{body}' if heading else body)
+        if missing:
+            description = '\n\n'.join(part for part in [description.strip()] + missing if part)
+        return description
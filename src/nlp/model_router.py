@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+from src.nlp.input_trimmer import estimate_tokens
+from src.nlp.prefilter import DATE_PATTERN, TIME_OF_DAY_PATTERN
+
+# Holidays and working-day references that need the holiday calendar to resolve
+HOLIDAY_PATTERN = re.compile(
+    r'元旦|春节|清明|劳动节|五一|端午|中秋|国庆|节前|节后|调休|工作日|'
+    r'(?<![a-z])(?:holidays?|new year|christmas|thanksgiving|business day|working day)(?![a-z])'
+)
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+
+# Complexity weights; a score at or above the threshold goes to the strong model
+LENGTH_WEIGHT = 0.01         # per estimated token
+TIME_EXPRESSION_WEIGHT = 0.5  # per date/time expression after the first
+HOLIDAY_WEIGHT = 2.0         # per holiday or working-day reference
+EMAIL_WEIGHT = 0.5           # per email address
+DEFAULT_THRESHOLD = 2.0
+
+FAST = 'fast'
+STRONG = 'strong'
+
+@dataclass
+class ComplexityScore:
+    """Local estimate of how hard an input is to parse"""
+    score: float
+    tokens: int
+    time_expressions: int
+    holidays: int
+    emails: int
+
+def score_complexity(text: str) -> ComplexityScore:
+    """Score input complexity from length, time expressions, holidays and emails"""
+    lowered = text.lower()
+    tokens = estimate_tokens(text)
+    time_expressions = (len(TIME_OF_DAY_PATTERN.findall(lowered))
+                        + len(DATE_PATTERN.findall(lowered)))
+    holidays = len(HOLIDAY_PATTERN.findall(lowered))
+    emails = len(EMAIL_PATTERN.findall(text))
+    score = (tokens * LENGTH_WEIGHT
+             + max(0, time_expressions - 1) * TIME_EXPRESSION_WEIGHT
+             + holidays * HOLIDAY_WEIGHT
+             + emails * EMAIL_WEIGHT)
+    return ComplexityScore(score, tokens, time_expressions, holidays, emails)
+
+@dataclass
+class RouteStats:
+    """Latency and success counters for one route"""
+    model: str
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    escalations: int = 0
+    total_latency: float = 0.0
+    total_score: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'calls': self.calls,
+            'successes': self.successes,
+            'failures': self.failures,
+            'escalations': self.escalations,
+            'success_rate': self.successes / self.calls if self.calls else None,
+            'avg_latency': self.total_latency / self.calls if self.calls else None,
+            'avg_score': self.total_score / self.calls if self.calls else None,
+        }
+
+class ModelRouter:
+    """Route simple inputs to a fast model and complex ones to a strong model"""
+
+    def __init__(self, fast_model: str, strong_model: str, threshold: float = DEFAULT_THRESHOLD):
+        """Initialize the router
+
+        Args:
+            fast_model (str): Cheap model for simple inputs
+            strong_model (str): Accurate model for complex inputs and escalations
+            threshold (float, optional): Complexity score at which inputs go to the
+                strong model. Defaults to DEFAULT_THRESHOLD.
+        """
+        self.models = {FAST: fast_model, STRONG: strong_model}
+        self.threshold = threshold
+        self._stats = {route: RouteStats(model) for route, model in self.models.items()}
+        self._lock = threading.Lock()
+
+    def route(self, text: str) -> Tuple[str, float]:
+        """Return FAST or STRONG for text together with its complexity score"""
+        score = score_complexity(text).score
+        return (STRONG if score >= self.threshold else FAST), score
+
+    def record(self, route: str, latency: float, success: bool, score: float,
+               escalated: bool = False) -> None:
+        """Record the outcome of one call on a route"""
+        with self._lock:
+            stats = self._stats[route]
+            stats.calls += 1
+            stats.total_latency += latency
+            stats.total_score += score
+            if success:
+                stats.successes += 1
+            else:
+                stats.failures += 1
+            if escalated:
+                stats.escalations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-route latency and success statistics"""
+        with self._lock:
+            result = {route: stats.as_dict() for route, stats in self._stats.items()}
+        result['threshold'] = self.threshold
+        return result
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# English patterns use letter lookarounds instead of \b because CJK characters
+# count as word characters ("3pm开会" has no word boundary after "pm")
+def _words(*words: str) -> str:
+    return r'(?<![a-z])(?:' + '|'.join(words) + r')(?![a-z])'
+
+CN_NUMBER = r'[0-9零〇一二两三四五六七八九十]'
+# Bare "sat" and "sun" are common words, so they only count when followed by a number
+WEEKDAYS_EN = (r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|'
+               r'mon|tues?|wed|thu(?:rs?)?|fri|(?:sat|sun)\.?(?=\s*\d))')
+MONTHS_EN = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|'
+             r'aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+
+# Clock times and parts of the day
+TIME_OF_DAY_PATTERN = re.compile('|'.join([
+    r'(?<!\d)\d{1,2}(?::\d{2})?\s*(?:am|pm|a\.m\.|p\.m\.)(?![a-z])',
+    r'(?<![\d:])(?:[01]?\d|2[0-3])[:：][0-5]\d(?![\d:])',
+    _words('at') + r'\s+(?:[01]?\d|2[0-3])(?![\d:./%])',
+    _words('noon', 'midnight', 'morning', 'afternoon', 'evening', 'tonight', "o'clock"),
+    CN_NUMBER + r'{1,3}\s*[点點时](?![点點])',
+    r'早上|早晨|上午|中午|下午|晚上|傍晚|凌晨|今晚|明晚|午饭后|午休后',
+]))
+
+# Calendar dates, relative days, weekdays and holidays
+DATE_PATTERN = re.compile('|'.join([
+    _words('today', 'tomorrow', 'tonight', 'weekend'),
+    _words('next', 'this', 'coming') + r'\s+(?:week|month|' + WEEKDAYS_EN + r')(?![a-z])',
+    _words(WEEKDAYS_EN),
+    _words(MONTHS_EN) + r'\.?\s*\d{1,2}(?:st|nd|rd|th)?(?![\d])',
+    r'(?<!\d)\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?' + MONTHS_EN + r'(?![a-z])',
+    r'(?<!\d)\d{4}[-/.]\d{1,2}[-/.]\d{1,2}(?!\d)',
+    r'(?<![\d/])\d{1,2}/\d{1,2}(?![\d/])',
+    r'今天|明天|后天|大后天|今日|明日',
+    r'(?:下下|下个?|这个?|本|上)?(?:周|星期|礼拜)[一二三四五六日天末]',
+    r'(?:下下|下个?|这个?|本)(?:周|星期|礼拜|月)',
+    CN_NUMBER + r'{1,2}\s*月\s*' + CN_NUMBER + r'{1,3}\s*[日号號]',
+    r'(?<!\d)\d{1,2}\s*[日号號](?!本)',
+    r'\d{4}\s*年',
+    r'月底|月初|月末|年底|工作日',
+    r'元旦|春节|清明|劳动节|五一|端午|中秋|国庆|节前|节后',
+]))
+
+# Words suggesting something is scheduled
+EVENT_CUE_PATTERN = re.compile('|'.join([
+    _words('meet', 'meeting', 'meetings', 'call', 'calls', 'seminar', 'talk', 'lecture', 'class',
+           'lunch', 'dinner', 'breakfast', 'coffee', 'interview', 'review', 'standup', 'stand-up',
+           'presentation', 'appointment', 'conference', 'workshop', 'party', 'demo', 'sync',
+           'webinar', 'deadline', 'exam', 'flight', 'visit', 'remind', 'reminder', 'discuss',
+           'discussion', 'session', 'training', 'event', 'zoom', 'room', 'hall', 'office',
+           'gym', 'dentist', 'doctor', 'pick up', 'due', 'submit', 'defense', 'colloquium'),
+    r'会议|开会|例会|组会|年会|会面|见面|见个面|碰面|面试|评审|讨论|研讨|答辩|汇报|报告|讲座|沙龙|分享',
+    r'吃饭|午饭|晚饭|午餐|晚餐|早餐|聚餐|聚会|上课|课程|培训|考试|活动|演示|演讲|总结|复盘',
+    r'约|提醒|出发|航班|接机|送机|拜访|等你|截止|提交|体检|看病|门诊|健身',
+]))
+
+TIME_OF_DAY_WEIGHT = 2
+DATE_WEIGHT = 1
+EVENT_CUE_WEIGHT = 2
+MIN_SCORE = 3
+
+@dataclass
+class PrefilterResult:
+    """Outcome of the local pre-flight check"""
+    accepted: bool
+    score: int
+    reasons: List[str]
+
+def score_text(text: str) -> PrefilterResult:
+    """Score text for date/time expressions and event cues without calling the model
+
+    Text is accepted when it contains a date or time expression and scores at
+    least MIN_SCORE, e.g. a date plus an event cue, or a date plus a clock time.
+    """
+    text = text.lower()
+    reasons = []
+    score = 0
+    if TIME_OF_DAY_PATTERN.search(text):
+        score += TIME_OF_DAY_WEIGHT
+        reasons.append('time')
+    if DATE_PATTERN.search(text):
+        score += DATE_WEIGHT
+        reasons.append('date')
+    has_datetime = bool(reasons)
+    if EVENT_CUE_PATTERN.search(text):
+        score += EVENT_CUE_WEIGHT
+        reasons.append('event')
+    return PrefilterResult(has_datetime and score >= MIN_SCORE, score, reasons)
+
+def is_event_text(text: str) -> bool:
+    """Return True if text looks like an event description"""
+    return score_text(text).accepted
+
+def load_corpus(path: str) -> List[Tuple[bool, str]]:
+    """Load (is_event, text) pairs from a tab-separated labelled corpus"""
+    corpus = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            label, text = line.split('\t', 1)
+            corpus.append((label == '1', text))
+    return corpus
+
+def evaluate(corpus: List[Tuple[bool, str]]) -> Tuple[float, float, List[Tuple[bool, str]]]:
+    """Return precision, recall and the misclassified entries of a labelled corpus"""
+    true_positive = false_positive = false_negative = 0
+    errors = []
+    for is_event, text in corpus:
+        accepted = is_event_text(text)
+        true_positive += accepted and is_event
+        false_positive += accepted and not is_event
+        false_negative += is_event and not accepted
+        if accepted != is_event:
+            errors.append((is_event, text))
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 0.0
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 0.0
+    return precision, recall, errors
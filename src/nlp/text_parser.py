@@ -3,12 +3,15 @@
 from datetime import datetime, timedelta
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from dataclasses import dataclass
 from openai import OpenAI
-import pytz
 import time
 from json.decoder import JSONDecodeError
+from src.calendar.timezones import get_zone
+from src.nlp.input_trimmer import InputTrimmer, TrimmedText, estimate_tokens
+from src.nlp.prefilter import score_text
+from src.nlp.model_router import ModelRouter, DEFAULT_THRESHOLD, FAST, STRONG
 
 # ������־
 logging.basicConfig(
@@ -21,8 +24,22 @@ class ParsingError(Exception):
     """Custom exception for parsing errors"""
     pass
 
-def get_system_prompt(current_date: str) -> str:
+PLACEHOLDER_RULE = """
+8. Placeholders:
+   - The input may contain placeholders like [[ABSTRACT_1]], [[BIO_1]] or [[LINK_1]] that stand for omitted text
+   - Never expand or rewrite a placeholder; copy it verbatim into the description where its content belongs
+   - A [[LINK_n]] placeholder may be used as the location of an online meeting
+"""
+
+BATCH_INSTRUCTIONS = """
+
+The user message contains {count} independent inputs, each starting with "### Input N".
+Parse each input separately with the rules above and return a JSON object of the form
+{{"events": [result for input 1, result for input 2, ...]}} with exactly {count} results in input order."""
+
+def get_system_prompt(current_date: str, has_placeholders: bool = False) -> str:
     """Generate system prompt with current date"""
+    placeholder_rule = PLACEHOLDER_RULE if has_placeholders else ""
     return f"""You are a calendar event parsing assistant. Your task is to extract event information from natural language descriptions.
 
 Please extract the following information in JSON format:
@@ -114,7 +131,7 @@ This talk introduces recent developments in quantum error correction. We will di
 Meeting Link:
 Zoom: https://zoom.us/j/123456
 Passcode: qc2024"
-
+{placeholder_rule}
 Return only the JSON result without any additional text."""
 
 class TextParser:
@@ -122,7 +139,9 @@ class TextParser:
     
     def __init__(self, api_key: str, base_url: str = "https://api.openai.com/v1", 
                  model: str = "gpt-3.5-turbo", timezone: str = 'Asia/Shanghai', 
-                 max_retries: int = 3):
+                 max_retries: int = 3, trim_long_sections: bool = True,
+                 max_input_tokens: Optional[int] = None, strong_model: Optional[str] = None,
+                 complexity_threshold: float = DEFAULT_THRESHOLD):
         """Initialize the parser with API key and timezone
         
         Args:
@@ -131,21 +150,38 @@ class TextParser:
             model (str, optional): Model name to use. Defaults to "gpt-3.5-turbo".
             timezone (str, optional): Timezone for date parsing. Defaults to 'Asia/Shanghai'.
             max_retries (int, optional): Maximum number of API call retries. Defaults to 3.
+            trim_long_sections (bool, optional): Send long abstracts, bios and links as
+                placeholders and restore them locally. Defaults to True.
+            max_input_tokens (int, optional): Estimated token budget for the user message.
+                Defaults to None (no budget).
+            strong_model (str, optional): Stronger model for complex inputs. When set,
+                simple inputs go to `model` and are escalated to `strong_model` if
+                validation fails. Defaults to None (always use `model`).
+            complexity_threshold (float, optional): Complexity score at which inputs are
+                sent to `strong_model`. Defaults to DEFAULT_THRESHOLD.
         """
         self.client = OpenAI(
             api_key=api_key,
             base_url=base_url
         )
         self.model = model
-        self.timezone = pytz.timezone(timezone)
+        self.timezone = get_zone(timezone)
         self.max_retries = max_retries
+        self.trim_long_sections = trim_long_sections
+        self.max_input_tokens = max_input_tokens
+        self.trimmer = InputTrimmer()
+        self.router = ModelRouter(model, strong_model, complexity_threshold) if strong_model else None
         
-    def _call_api(self, messages: list, retry_count: int = 0) -> Dict[str, Any]:
+    def _call_api(self, messages: list, retry_count: int = 0, model: Optional[str] = None,
+                  max_retries: Optional[int] = None) -> Dict[str, Any]:
         """Call the API with retry mechanism"""
+        model = model or self.model
+        if max_retries is None:
+            max_retries = self.max_retries
         try:
-            logger.info(f"Calling API (attempt {retry_count + 1})")
+            logger.info(f"Calling API with {model} (attempt {retry_count + 1})")
             response = self.client.chat.completions.create(
-                model=self.model,
+                model=model,
                 messages=messages,
                 temperature=0.1
             )
@@ -157,24 +193,40 @@ class TextParser:
             except JSONDecodeError as e:
                 logger.warning(f"JSON parsing error: {str(e)}")
                 logger.warning(f"Raw response: {content}")
-                if retry_count < self.max_retries:
-                    logger.info(f"Retrying... ({retry_count + 1}/{self.max_retries})")
+                if retry_count < max_retries:
+                    logger.info(f"Retrying... ({retry_count + 1}/{max_retries})")
                     time.sleep(1)  # ���Ӷ����ӳٱ����������
-                    return self._call_api(messages, retry_count + 1)
-                raise ParsingError(f"Failed to parse JSON after {self.max_retries} attempts")
+                    return self._call_api(messages, retry_count + 1, model, max_retries)
+                raise ParsingError(f"Failed to parse JSON after {max_retries} attempts")
                 
         except Exception as e:
             logger.error(f"API call error: {str(e)}")
-            if retry_count < self.max_retries:
-                logger.info(f"Retrying... ({retry_count + 1}/{self.max_retries})")
+            if retry_count < max_retries:
+                logger.info(f"Retrying... ({retry_count + 1}/{max_retries})")
                 time.sleep(1)
-                return self._call_api(messages, retry_count + 1)
-            raise ParsingError(f"API call failed after {self.max_retries} attempts: {str(e)}")
+                return self._call_api(messages, retry_count + 1, model, max_retries)
+            raise ParsingError(f"API call failed after {max_retries} attempts: {str(e)}")
     
-    def parse_text(self, text: str) -> Dict[str, Any]:
-        """Parse natural language text into event data"""
-        logger.info(f"Parsing text: {text}")
+    def _prepare_input(self, text: str) -> TrimmedText:
+        """Trim free-text sections and enforce the input token budget"""
+        if self.trim_long_sections:
+            trimmed = self.trimmer.trim(text)
+        else:
+            trimmed = TrimmedText(text=text)
         
+        if self.max_input_tokens is None or estimate_tokens(trimmed.text) <= self.max_input_tokens:
+            return trimmed
+            
+        # Over budget: replace every detected section regardless of its length
+        trimmed = self.trimmer.trim(text, min_section_tokens=0)
+        tokens = estimate_tokens(trimmed.text)
+        if tokens > self.max_input_tokens:
+            raise ParsingError(f"Input text exceeds token budget ({tokens} > {self.max_input_tokens})")
+        logger.info(f"Trimmed input to {tokens} tokens to fit the budget")
+        return trimmed
+    
+    def _validate_input(self, text: str) -> str:
+        """Check that text is worth sending to the model and return it stripped"""
         # Validate input text
         if not text or not text.strip():
             raise ParsingError("Empty or invalid input text")
@@ -184,39 +236,23 @@ class TextParser:
         if len(text) < 3:  # Set minimum length requirement
             raise ParsingError("Input text too short")
             
-        # Check for time-related information
-        time_indicators = [
-            # English time indicators
-            'today', 'tomorrow', 'next',
-            'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
-            'am', 'pm', ':', 'at',
-            'morning', 'afternoon', 'evening',
-            
-            # Chinese time indicators
-            '点', '分', '早上', '上午', '中午', '下午', '晚上', '傍晚',
-            '今天', '明天', '后天', '大后天',
-            '周一', '周二', '周三', '周四', '周五', '周六', '周日',
-            '星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日',
-            '下周', '下下周', '这周', '本周',
-            '月', '年', '日',
-            '过', '到', '从'
-        ]
-        
-        has_time_info = any(indicator in text for indicator in time_indicators)
-        if not has_time_info:
-            raise ParsingError("No time information found in input text")
+        # Reject inputs without a date/time expression or event cue before any API call
+        prefilter = score_text(text)
+        if not prefilter.accepted:
+            if 'time' not in prefilter.reasons and 'date' not in prefilter.reasons:
+                raise ParsingError("No time information found in input text")
+            raise ParsingError("No event information found in input text")
+        return text
+    
+    def _current_date(self) -> str:
+        """Get current date in the specified timezone"""
+        return datetime.now(self.timezone).strftime('%Y-%m-%d')
+    
+    def _finalize_result(self, result: Any, text: str, trimmed: TrimmedText) -> Dict[str, Any]:
+        """Validate a model result and fill in defaults"""
+        if not isinstance(result, dict):
+            raise ParsingError("Model result is not a JSON object")
             
-        # Get current date in the specified timezone
-        now = datetime.now(self.timezone)
-        current_date = now.strftime('%Y-%m-%d')
-        
-        messages = [
-            {"role": "system", "content": get_system_prompt(current_date)},
-            {"role": "user", "content": text}
-        ]
-        
-        result = self._call_api(messages)
-        
         # Validate required fields
         required_fields = ['summary', 'start_time']
         missing_fields = [field for field in required_fields if field not in result]
@@ -228,7 +264,7 @@ class TextParser:
             datetime.strptime(result['start_time'], '%Y-%m-%d %H:%M')
             if 'end_time' in result:
                 datetime.strptime(result['end_time'], '%Y-%m-%d %H:%M')
-        except ValueError as e:
+        except (TypeError, ValueError) as e:
             raise ParsingError(f"Invalid datetime format: {str(e)}")
         
         # If no end time is specified, set it to 1 hour after start time
@@ -236,37 +272,183 @@ class TextParser:
             start_time = datetime.strptime(result['start_time'], '%Y-%m-%d %H:%M')
             result['end_time'] = (start_time + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M')
             
+        # Rebuild trimmed sections from the original text
+        if trimmed.trimmed:
+            result['description'] = self.trimmer.restore(result.get('description'), trimmed)
+            for field in ('summary', 'location'):
+                result[field] = self.trimmer.expand(result.get(field), trimmed)
+            
         # Set other default values
         result.setdefault('location', None)
         result.setdefault('description', text)
         result.setdefault('attendees', [])
         result.setdefault('reminder_minutes', 15)
+        return result
+    
+    def _messages(self, trimmed: TrimmedText) -> list:
+        """Build the chat messages for a single input"""
+        return [
+            {"role": "system", "content": get_system_prompt(self._current_date(), trimmed.trimmed)},
+            {"role": "user", "content": trimmed.text}
+        ]
+    
+    def _request(self, messages: list, text: str, trimmed: TrimmedText) -> Dict[str, Any]:
+        """Call the model and validate the result, routing by complexity when enabled"""
+        if self.router is None:
+            return self._finalize_result(self._call_api(messages), text, trimmed)
+            
+        route, score = self.router.route(text)
+        started = time.monotonic()
+        try:
+            # The fast route escalates instead of retrying
+            max_retries = 0 if route == FAST else None
+            result = self._call_api(messages, model=self.router.models[route], max_retries=max_retries)
+            result = self._finalize_result(result, text, trimmed)
+        except ParsingError as e:
+            self.router.record(route, time.monotonic() - started, False, score, escalated=route == FAST)
+            if route == STRONG:
+                raise
+            logger.info(f"Escalating to {self.router.models[STRONG]}: {str(e)}")
+            return self._request_strong(messages, text, trimmed, score)
+        self.router.record(route, time.monotonic() - started, True, score)
+        return result
+    
+    def _request_strong(self, messages: list, text: str, trimmed: TrimmedText,
+                        score: float) -> Dict[str, Any]:
+        """Retry an escalated request on the strong model"""
+        started = time.monotonic()
+        try:
+            result = self._call_api(messages, model=self.router.models[STRONG])
+            result = self._finalize_result(result, text, trimmed)
+        except ParsingError:
+            self.router.record(STRONG, time.monotonic() - started, False, score)
+            raise
+        self.router.record(STRONG, time.monotonic() - started, True, score)
+        return result
+    
+    def routing_stats(self) -> Dict[str, Any]:
+        """Return per-route latency and success statistics (empty without routing)"""
+        return self.router.stats() if self.router is not None else {}
+    
+    def parse_text(self, text: str) -> Dict[str, Any]:
+        """Parse natural language text into event data"""
+        logger.info(f"Parsing text: {text}")
+        
+        text = self._validate_input(text)
+        
+        trimmed = self._prepare_input(text)
+        if trimmed.trimmed:
+            logger.info(f"Replaced {len(trimmed.sections)} section(s) with placeholders")
+        
+        result = self._request(self._messages(trimmed), text, trimmed)
         
         logger.info("Successfully parsed text")
         logger.debug(f"Parsing result: {result}")
         
         return result
+    
+    def parse_texts(self, texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """Parse several independent texts with a single API call
         
-    def parse_to_event_data(self, text: str) -> 'EventData':
-        """Parse text and return EventData object"""
+        Returns one entry per input in the same order: the parsed result, or the
+        exception raised for that input. Inputs the batched call fails to parse
+        are retried one by one: on the strong model when routing is enabled,
+        otherwise with parse_text.
+        """
+        results: List[Union[Dict[str, Any], Exception]] = [None] * len(texts)
+        batch = []  # (index, text, trimmed)
+        for index, text in enumerate(texts):
+            try:
+                text = self._validate_input(text)
+                batch.append((index, text, self._prepare_input(text)))
+            except ParsingError as e:
+                results[index] = e
+                
+        if len(batch) > 1:
+            logger.info(f"Parsing batch of {len(batch)} texts")
+            has_placeholders = any(trimmed.trimmed for _, _, trimmed in batch)
+            user_content = "\n\n".join(
+                f"### Input {number}\n{trimmed.text}"
+                for number, (_, _, trimmed) in enumerate(batch, 1)
+            )
+            messages = [
+                {"role": "system", "content": get_system_prompt(self._current_date(), has_placeholders)
+                                              + BATCH_INSTRUCTIONS.format(count=len(batch))},
+                {"role": "user", "content": user_content}
+            ]
+            # Any complex input sends the whole batch to the strong model
+            route, model, max_retries, scores = None, None, None, [0.0] * len(batch)
+            if self.router is not None:
+                routes, scores = zip(*(self.router.route(text) for _, text, _ in batch))
+                route = STRONG if STRONG in routes else FAST
+                model = self.router.models[route]
+                # The fast route escalates instead of retrying
+                max_retries = 0 if route == FAST else None
+            started = time.monotonic()
+            try:
+                events = self._call_api(messages, model=model, max_retries=max_retries).get('events')
+            except (ParsingError, AttributeError) as e:
+                logger.warning(f"Batch parsing failed: {str(e)}")
+                events = None
+            latency = time.monotonic() - started
+            if not isinstance(events, list) or len(events) != len(batch):
+                events = [None] * len(batch)
+                
+            failed = []  # (index, text, trimmed, score)
+            for (index, text, trimmed), event, score in zip(batch, events, scores):
+                try:
+                    results[index] = self._finalize_result(event, text, trimmed)
+                    success = True
+                except ParsingError:
+                    failed.append((index, text, trimmed, score))
+                    success = False
+                # Every input in the batch waited for the whole call
+                if self.router is not None:
+                    self.router.record(route, latency, success, score,
+                                       escalated=not success and route == FAST)
+                    
+            if self.router is not None:
+                for index, text, trimmed, score in failed:
+                    logger.info(f"Retrying input {index + 1} on {self.router.models[STRONG]}")
+                    try:
+                        results[index] = self._request_strong(self._messages(trimmed), text, trimmed, score)
+                    except Exception as e:
+                        results[index] = e
+                batch = []
+            else:
+                batch = [(index, text, trimmed) for index, text, trimmed, _ in failed]
+                
+        # Single inputs and batch failures go through the regular path
+        for index, text, _ in batch:
+            try:
+                results[index] = self.parse_text(text)
+            except Exception as e:
+                results[index] = e
+        return results
+    
+    def to_event_data(self, result: Dict[str, Any]) -> 'EventData':
+        """Convert a parsing result into an EventData object"""
         from src.calendar.ics_generator import EventData
         
+        # Convert time strings to datetime objects
+        start_time = datetime.strptime(result['start_time'], '%Y-%m-%d %H:%M')
+        end_time = datetime.strptime(result['end_time'], '%Y-%m-%d %H:%M')
+        
+        return EventData(
+            summary=result['summary'],
+            start_time=start_time,
+            end_time=end_time,
+            location=result['location'],
+            description=result['description'],
+            attendees=result['attendees'],
+            reminder_minutes=result['reminder_minutes']
+        )
+        
+    def parse_to_event_data(self, text: str) -> 'EventData':
+        """Parse text and return EventData object"""
         try:
             result = self.parse_text(text)
-            
-            # Convert time strings to datetime objects
-            start_time = datetime.strptime(result['start_time'], '%Y-%m-%d %H:%M')
-            end_time = datetime.strptime(result['end_time'], '%Y-%m-%d %H:%M')
-            
-            return EventData(
-                summary=result['summary'],
-                start_time=start_time,
-                end_time=end_time,
-                location=result['location'],
-                description=result['description'],
-                attendees=result['attendees'],
-                reminder_minutes=result['reminder_minutes']
-            )
+            return self.to_event_data(result)
         except Exception as e:
             logger.error(f"Error creating EventData: {str(e)}")
             raise 
\ No newline at end of file
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import json
+import argparse
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp.text_parser import TextParser, ParsingError
+from src.nlp.model_router import DEFAULT_THRESHOLD
+from src.calendar.ics_generator import ICSGenerator
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Collect concurrent parse requests and send them to the model together"""
+
+    def __init__(self, parser: TextParser, window: float = 0.05, max_batch_size: int = 8,
+                 max_concurrent_batches: int = 4):
+        """Initialize the batcher
+
+        Args:
+            parser (TextParser): Shared parser used for every batch
+            window (float, optional): Seconds to wait for more requests after the first one.
+                Defaults to 0.05.
+            max_batch_size (int, optional): Maximum texts per API call. Defaults to 8.
+            max_concurrent_batches (int, optional): Batches dispatched in parallel. Defaults to 4.
+        """
+        self.parser = parser
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: 'queue.Queue[Tuple[str, Future]]' = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for parsing and return a future for its result"""
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _run(self) -> None:
+        """Group queued texts arriving within the window into batches"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        """Parse a batch and resolve its futures"""
+        try:
+            results = self.parser.parse_texts([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+class CalendarServer(ThreadingHTTPServer):
+    """HTTP server holding the warm parser, batcher and generator settings"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], parser: TextParser, batcher: MicroBatcher,
+                 timezone: str = 'Asia/Shanghai', use_utc: bool = False):
+        super().__init__(address, CalendarRequestHandler)
+        self.parser = parser
+        self.batcher = batcher
+        self.timezone = timezone
+        self.use_utc = use_utc
+
+class CalendarRequestHandler(BaseHTTPRequestHandler):
+    """Handle POST /parse, POST /ics and GET /stats"""
+
+    protocol_version = 'HTTP/1.1'
+    server: CalendarServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_texts(self) -> Tuple[List[str], bool]:
+        """Read {"text": ...} or {"texts": [...]} from the request body"""
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ParsingError("Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise ParsingError("Request body must be a JSON object")
+        if isinstance(payload.get('texts'), list):
+            if not payload['texts']:
+                raise ParsingError("'texts' must not be empty")
+            return [str(text) for text in payload['texts']], True
+        if isinstance(payload.get('text'), str):
+            return [payload['text']], False
+        raise ParsingError("Request body needs a 'text' string or a 'texts' list")
+
+    def _parse(self, texts: List[str]) -> List[Any]:
+        """Parse texts through the shared batcher"""
+        futures = [self.server.batcher.submit(text) for text in texts]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def do_GET(self) -> None:
+        if self.path != '/stats':
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, {"routing": self.server.parser.routing_stats()})
+
+    def do_POST(self) -> None:
+        if self.path not in ('/parse', '/ics'):
+            self.close_connection = True  # the request body was not read
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            texts, many = self._read_texts()
+        except ParsingError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        results = self._parse(texts)
+        if self.path == '/parse':
+            self._handle_parse(results, many)
+        else:
+            self._handle_ics(results)
+
+    def _handle_parse(self, results: List[Any], many: bool) -> None:
+        items = [
+            {"error": str(result)} if isinstance(result, Exception) else result
+            for result in results
+        ]
+        if many:
+            self._send_json(200, {"results": items})
+        elif isinstance(results[0], Exception):
+            self._send_json(422, items[0])
+        else:
+            self._send_json(200, items[0])
+
+    def _handle_ics(self, results: List[Any]) -> None:
+        generator = ICSGenerator(timezone=self.server.timezone, use_utc=self.server.use_utc)
+        errors = []
+        for index, result in enumerate(results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                generator.add_event(self.server.parser.to_event_data(result))
+            except Exception as e:
+                errors.append({"index": index, "error": str(e)})
+        if len(errors) == len(results):
+            self._send_json(422, {"errors": errors})
+            return
+
+        # Stream the calendar with chunked transfer encoding
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/calendar; charset=utf-8')
+        self.send_header('Content-Disposition', 'attachment; filename="my_calendar.ics"')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('X-Failed-Events', str(len(errors)))
+        self.end_headers()
+        for chunk in generator.iter_ical():
+            self.wfile.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="AI Calendar Assistant local HTTP service")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--api-key', default=os.environ.get('OPENAI_API_KEY'))
+    arg_parser.add_argument('--base-url', default='https://api.openai.com/v1')
+    arg_parser.add_argument('--model', default='gpt-3.5-turbo')
+    arg_parser.add_argument('--strong-model', default=None,
+                            help="route complex inputs and failed parses to this model")
+    arg_parser.add_argument('--complexity-threshold', type=float, default=DEFAULT_THRESHOLD)
+    arg_parser.add_argument('--timezone', default='Asia/Shanghai')
+    arg_parser.add_argument('--utc', action='store_true', help="write .ics times as UTC")
+    arg_parser.add_argument('--batch-window', type=float, default=0.05,
+                            help="seconds to wait for concurrent requests before calling the API")
+    arg_parser.add_argument('--max-batch-size', type=int, default=8)
+    args = arg_parser.parse_args()
+
+    if not args.api_key:
+        arg_parser.error("an API key is required (--api-key or OPENAI_API_KEY)")
+
+    parser = TextParser(
+        api_key=args.api_key,
+        base_url=args.base_url,
+        model=args.model,
+        timezone=args.timezone,
+        strong_model=args.strong_model,
+        complexity_threshold=args.complexity_threshold
+    )
+    batcher = MicroBatcher(parser, window=args.batch_window, max_batch_size=args.max_batch_size)
+    server = CalendarServer((args.host, args.port), parser, batcher,
+                            timezone=args.timezone, use_utc=args.utc)
+
+    logger.info(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+INPUT_PATTERN = re.compile(r'### Input \d+\n(.*?)(?=\n\n### Input \d+\n|\Z)', re.S)
+
+def batch_inputs(messages: List[Dict[str, str]]) -> List[str]:
+    """Return the inputs of a batched request, or [] for a single input"""
+    return INPUT_PATTERN.findall(messages[1]['content'])
+
+def echo_event(text: str) -> Dict[str, Any]:
+    """A valid parsing result whose summary is the input text"""
+    return {"summary": text, "start_time": "2025-01-02 10:00"}
+
+def echo_responder(model: str, messages: List[Dict[str, str]]) -> Any:
+    """Answer single and batched requests with one valid event per input"""
+    inputs = batch_inputs(messages)
+    if inputs:
+        return {"events": [echo_event(text) for text in inputs]}
+    return echo_event(messages[1]['content'])
+
+class StubClient:
+    """Stand-in for OpenAI().chat.completions that records calls"""
+
+    def __init__(self, responder: Callable[[str, List[Dict[str, str]]], Any] = echo_responder):
+        self.responder = responder
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs: Any) -> Any:
+        with self._lock:
+            self.calls.append({"model": model, "messages": messages})
+        content = self.responder(model, messages)
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
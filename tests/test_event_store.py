@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.calendar.event_store import EventStore
+from src.calendar.ics_generator import ICSGenerator, EventData
+
+class TestEventStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = EventStore(os.path.join(self.tmpdir.name, 'events.db'))
+        start = datetime(2025, 1, 1, 9, 0)
+        self.store.add_events([
+            EventData(
+                summary=f'项目进展会 {i}' if i % 2 else f'Product Review {i}',
+                start_time=start + timedelta(days=i),
+                end_time=start + timedelta(days=i, hours=1),
+                location='3楼会议室',
+                attendees=['zhang@example.com'],
+            )
+            for i in range(30)
+        ])
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_date_range_query(self):
+        """Test querying events overlapping a date range"""
+        events = list(self.store.query(datetime(2025, 1, 10), datetime(2025, 1, 13)))
+        self.assertEqual([e.start_time.day for e in events], [10, 11, 12])
+        self.assertEqual(events[0].attendees, ['zhang@example.com'])
+        self.assertIsNotNone(events[0].uid)
+
+    def test_text_query(self):
+        """Test full-text and short substring queries"""
+        self.assertEqual(self.store.count(text='项目进展'), 15)
+        self.assertEqual(self.store.count(text='Review'), 15)
+        self.assertEqual(self.store.count(text='会'), 30)
+        self.assertEqual(self.store.count(datetime(2025, 1, 1), datetime(2025, 1, 5), text='Review'), 2)
+
+    def test_upsert_and_delete(self):
+        """Test that events with the same UID are updated in place"""
+        event = next(self.store.query(limit=1))
+        event.summary = 'Renamed'
+        self.store.add_event(event)
+        self.assertEqual(self.store.count(), 30)
+        self.assertEqual(self.store.count(text='Renamed'), 1)
+        self.assertTrue(self.store.delete_event(event.uid))
+        self.assertEqual(self.store.count(), 29)
+
+    def test_export_subset(self):
+        """Test streaming a subset of events into an ICS file"""
+        filename = os.path.join(self.tmpdir.name, 'subset.ics')
+        written = self.store.export(filename, start=datetime(2025, 1, 20))
+        self.assertEqual(written, 11)
+        with open(filename, 'rb') as f:
+            ical = f.read().decode()
+        self.assertEqual(ical.count('BEGIN:VEVENT'), 11)
+        self.assertEqual(ical.count('BEGIN:VTIMEZONE'), 1)
+        self.assertTrue(ical.endswith('END:VCALENDAR\r\n'))
+
+    def test_generator_writes_to_store(self):
+        """Test that ICSGenerator records events and their UIDs in the store"""
+        generator = ICSGenerator(store=self.store)
+        generator.add_event(EventData(
+            summary='Budget Meeting',
+            start_time=datetime(2025, 3, 1, 15, 0),
+            end_time=datetime(2025, 3, 1, 16, 0),
+        ))
+        stored = list(self.store.query(text='Budget'))
+        self.assertEqual(len(stored), 1)
+        self.assertIn(f'UID:{stored[0].uid}', generator.to_ical().decode())
+
+    def test_generator_timezone_preserved(self):
+        """Test that events keep their instant when store and generator timezones differ"""
+        generator = ICSGenerator(timezone='America/New_York', store=self.store)
+        generator.add_event(EventData(
+            summary='New York Call',
+            start_time=datetime(2025, 7, 1, 9, 0),
+            end_time=datetime(2025, 7, 1, 10, 0),
+        ))
+        stored = next(self.store.query(text='New York'))
+        # 09:00 EDT is 13:00 UTC, i.e. 21:00 in the store's Asia/Shanghai timezone
+        self.assertEqual(stored.start_time, datetime(2025, 7, 1, 21, 0))
+
+if __name__ == '__main__':
+    unittest.main()
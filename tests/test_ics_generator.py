@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.calendar.ics_generator import ICSGenerator, EventData
+from src.calendar.timezones import get_offsets, get_zone
+
+class TestICSGenerator(unittest.TestCase):
+    def make_event(self, start: datetime) -> EventData:
+        return EventData(
+            summary='Team Meeting',
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+
+    def test_single_vtimezone(self):
+        """Test that one VTIMEZONE is emitted per calendar"""
+        generator = ICSGenerator(timezone='America/New_York')
+        generator.add_events([
+            self.make_event(datetime(2025, 1, 10, 9, 0)),
+            self.make_event(datetime(2025, 7, 10, 9, 0)),
+            self.make_event(datetime(2026, 3, 1, 9, 0)),
+        ])
+        ical = generator.to_ical().decode()
+        self.assertEqual(ical.count('BEGIN:VTIMEZONE'), 1)
+        self.assertIn('DTSTART;TZID=America/New_York:20250710T090000', ical)
+        self.assertIn('BEGIN:DAYLIGHT', ical)
+
+        # Serializing again must not duplicate the component
+        ical = generator.to_ical().decode()
+        self.assertEqual(ical.count('BEGIN:VTIMEZONE'), 1)
+
+    def test_utc_output(self):
+        """Test writing all times as UTC"""
+        generator = ICSGenerator(timezone='America/New_York', use_utc=True)
+        generator.add_event(self.make_event(datetime(2025, 7, 10, 9, 0)))
+        ical = generator.to_ical().decode()
+        self.assertNotIn('BEGIN:VTIMEZONE', ical)
+        self.assertIn('DTSTART:20250710T130000Z', ical)
+
+    def test_offsets_match_zone(self):
+        """Test memoized offsets against the tz database"""
+        offsets = get_offsets('Europe/Berlin')
+        zone = get_zone('Europe/Berlin')
+        time = datetime(2025, 1, 1, 0, 30)
+        while time.year == 2025:
+            expected = time.replace(tzinfo=zone).utcoffset()
+            self.assertEqual(offsets.utcoffset(time), expected, time)
+            time += timedelta(hours=7)
+        self.assertEqual(len(offsets.transitions(2025)), 2)
+
+    def test_zone_without_dst(self):
+        """Test that fixed-offset zones get a single period"""
+        generator = ICSGenerator()
+        generator.add_event(self.make_event(datetime(2025, 5, 1, 14, 0)))
+        ical = generator.to_ical().decode()
+        self.assertEqual(ical.count('BEGIN:STANDARD'), 1)
+        self.assertIn('TZOFFSETTO:+0800', ical)
+
+    def test_sharded_save_matches_serial(self):
+        """Test that parallel export writes the same bytes in the same order"""
+        start = datetime(2025, 1, 1, 9, 0)
+        for use_utc in (False, True):
+            generator = ICSGenerator(timezone='Europe/Berlin', use_utc=use_utc)
+            generator.add_events([
+                self.make_event(start + timedelta(days=i)) for i in range(50)
+            ])
+            with tempfile.TemporaryDirectory() as tmpdir:
+                serial = os.path.join(tmpdir, 'serial.ics')
+                sharded = os.path.join(tmpdir, 'sharded.ics')
+                generator.save(serial)
+                generator.save(sharded, workers=2, shard_size=7)
+                with open(serial, 'rb') as f1, open(sharded, 'rb') as f2:
+                    self.assertEqual(f1.read(), f2.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp.input_trimmer import InputTrimmer, estimate_tokens
+
+ABSTRACT = ("This talk introduces recent developments in quantum error correction. "
+            "We will discuss the surface code and its implementation on superconducting circuits, "
+            "including decoding algorithms, leakage reduction and lattice surgery. " * 3).strip()
+
+SEMINAR = (f"Prof. Smith's seminar on Quantum Computing, tomorrow 3pm in Room 2A.\n"
+           f"Abstract: {ABSTRACT}\n"
+           f"Join via Zoom: https://zoom.us/j/123456, Passcode: qc2024")
+
+class TestInputTrimmer(unittest.TestCase):
+    def setUp(self):
+        self.trimmer = InputTrimmer()
+
+    def test_trim_long_sections(self):
+        """Test that abstracts and links are replaced by placeholders"""
+        trimmed = self.trimmer.trim(SEMINAR)
+        self.assertIn('Abstract: [[ABSTRACT_1]]', trimmed.text)
+        self.assertIn('[[LINK_1]]', trimmed.text)
+        self.assertIn('tomorrow 3pm in Room 2A', trimmed.text)
+        self.assertNotIn('surface code', trimmed.text)
+        self.assertEqual(trimmed.sections['[[ABSTRACT_1]]'], ABSTRACT)
+        self.assertLess(estimate_tokens(trimmed.text), estimate_tokens(SEMINAR) / 2)
+
+    def test_scheduling_paragraph_after_section_kept(self):
+        """Test that a trailing paragraph with the time is not hidden in the abstract"""
+        text = (f"Quantum Computing Seminar\n"
+                f"Abstract: {ABSTRACT}\n\n"
+                f"More background on the surface code.\n\n"
+                f"The seminar will be held next Friday at 4pm in Room 101.")
+        trimmed = self.trimmer.trim(text)
+        self.assertIn('Abstract: [[ABSTRACT_1]]', trimmed.text)
+        self.assertIn('The seminar will be held next Friday at 4pm in Room 101.', trimmed.text)
+        self.assertIn('More background', trimmed.sections['[[ABSTRACT_1]]'])
+
+    def test_scheduling_line_after_section_kept(self):
+        """Test that a time on the line right after the abstract is not hidden"""
+        text = (f"Quantum seminar\n"
+                f"Abstract: {ABSTRACT}\n"
+                f"The seminar will be held next Friday at 4pm in Room 101.")
+        trimmed = self.trimmer.trim(text)
+        self.assertEqual(trimmed.text, "Quantum seminar\nAbstract: [[ABSTRACT_1]]\n"
+                                       "The seminar will be held next Friday at 4pm in Room 101.")
+        self.assertEqual(trimmed.sections['[[ABSTRACT_1]]'], ABSTRACT)
+
+        abstract = "本报告介绍量子纠错的最新进展，包括表面码、解码算法、泄漏抑制以及格点手术等内容。" * 3
+        trimmed = self.trimmer.trim(f"摘要：{abstract}\n下周五下午4点在理科楼101举行")
+        self.assertEqual(trimmed.text, "摘要：[[ABSTRACT_1]]\n下周五下午4点在理科楼101举行")
+
+    def test_scheduling_sentence_after_section_kept(self):
+        """Test that a time in the sentence after an inline abstract is not hidden"""
+        text = f"Quantum seminar. Abstract: {ABSTRACT} Join us next Friday at 4pm in Room 101."
+        trimmed = self.trimmer.trim(text)
+        self.assertEqual(trimmed.text, "Quantum seminar. Abstract: [[ABSTRACT_1]] "
+                                       "Join us next Friday at 4pm in Room 101.")
+        self.assertEqual(trimmed.sections['[[ABSTRACT_1]]'], ABSTRACT)
+
+    def test_compound_chinese_heading(self):
+        """Test that 报告时间 ends an abstract without leaking its prefix"""
+        abstract = "本报告介绍量子纠错的最新进展，包括表面码、解码算法、泄漏抑制以及格点手术等内容。" * 3
+        text = f"量子计算学术报告\n摘要：{abstract}\n报告时间：下周五下午4点\n报告地点：理科楼101"
+        trimmed = self.trimmer.trim(text)
+        self.assertIn('摘要：[[ABSTRACT_1]]\n报告时间：下周五下午4点', trimmed.text)
+        self.assertEqual(trimmed.sections['[[ABSTRACT_1]]'], abstract)
+
+    def test_short_sections_kept(self):
+        """Test that short sections are sent as is"""
+        text = "明天下午3点学术报告，摘要：量子纠错简介。"
+        trimmed = self.trimmer.trim(text)
+        self.assertEqual(trimmed.text, text)
+        self.assertFalse(trimmed.trimmed)
+
+    def test_restore(self):
+        """Test rebuilding the description from the original text"""
+        trimmed = self.trimmer.trim(SEMINAR)
+        description = "Speaker: Prof. Smith\n\nAbstract:\n[[ABSTRACT_1]]\n\nZoom: [[LINK_1]]"
+        restored = self.trimmer.restore(description, trimmed)
+        self.assertIn(ABSTRACT, restored)
+        self.assertIn('Zoom: https://zoom.us/j/123456', restored)
+
+        # Placeholders dropped by the model are appended
+        restored = self.trimmer.restore("Speaker: Prof. Smith", trimmed)
+        self.assertIn(f'Abstract:\n{ABSTRACT}', restored)
+        self.assertIn('https://zoom.us/j/123456', restored)
+
+    def test_estimate_tokens(self):
+        """Test the token estimator for mixed text"""
+        self.assertEqual(estimate_tokens(''), 0)
+        self.assertEqual(estimate_tokens('明天下午'), 4)
+        self.assertEqual(estimate_tokens('meeting'), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp.model_router import ModelRouter, score_complexity, FAST, STRONG
+from src.nlp.text_parser import TextParser
+from tests.stub_client import StubClient, batch_inputs, echo_event
+
+SEMINAR = """Prof. Smith's seminar on Quantum Computing
+Time: next Tuesday 4pm-5:30pm, Room 101
+Abstract: This talk introduces recent developments in quantum error correction.
+We will discuss the surface code and its implementation on superconducting circuits,
+including decoding algorithms, leakage reduction and lattice surgery.
+Bio: Prof. Smith leads the quantum information group and has published widely.
+Contact: smith@example.edu, cc: admin@example.edu
+Join via Zoom: https://zoom.us/j/123456, Passcode: qc2024"""
+
+class TestModelRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = ModelRouter('fast-model', 'strong-model')
+
+    def test_simple_inputs_use_fast_model(self):
+        """Test that short single-time inputs are routed to the fast model"""
+        for text in ["明天上午10点开会", "meeting tomorrow 3pm", "下周二下午2点半在3楼会议室开会"]:
+            self.assertEqual(self.router.route(text)[0], FAST, text)
+
+    def test_complex_inputs_use_strong_model(self):
+        """Test that holidays and long notices are routed to the strong model"""
+        for text in ["五一节前一天下午2点开总结会", "春节后第一个工作日上午9点开会", SEMINAR]:
+            self.assertEqual(self.router.route(text)[0], STRONG, text)
+
+    def test_complexity_features(self):
+        """Test the individual complexity features"""
+        complexity = score_complexity("明天上午11点和李总(lz@example.com)、王经理(wjl@example.com)开会")
+        self.assertEqual(complexity.emails, 2)
+        self.assertEqual(complexity.holidays, 0)
+        self.assertGreaterEqual(complexity.time_expressions, 2)
+
+    def test_stats(self):
+        """Test per-route statistics"""
+        self.router.record(FAST, 0.5, False, 1.0, escalated=True)
+        self.router.record(STRONG, 2.0, True, 1.0)
+        self.router.record(STRONG, 4.0, True, 3.0)
+        stats = self.router.stats()
+        self.assertEqual(stats[FAST]['escalations'], 1)
+        self.assertEqual(stats[FAST]['success_rate'], 0.0)
+        self.assertEqual(stats[STRONG]['model'], 'strong-model')
+        self.assertEqual(stats[STRONG]['avg_latency'], 3.0)
+        self.assertEqual(stats[STRONG]['avg_score'], 2.0)
+
+class TestRoutedParser(unittest.TestCase):
+    def make_parser(self, responder):
+        parser = TextParser(api_key="sk-xxxxxxx", model='fast-model', strong_model='strong-model')
+        parser.client = StubClient(responder)
+        return parser
+
+    def test_invalid_fast_result_escalated(self):
+        """Test that bad JSON from the fast model is retried once on the strong model"""
+        def responder(model, messages):
+            return "not json" if model == 'fast-model' else echo_event(messages[1]['content'])
+
+        parser = self.make_parser(responder)
+        result = parser.parse_text("明天上午10点开会")
+        self.assertEqual(result['summary'], "明天上午10点开会")
+        self.assertEqual([call['model'] for call in parser.client.calls], ['fast-model', 'strong-model'])
+
+        stats = parser.routing_stats()
+        self.assertEqual((stats[FAST]['calls'], stats[FAST]['failures'], stats[FAST]['escalations']), (1, 1, 1))
+        self.assertEqual((stats[STRONG]['calls'], stats[STRONG]['successes']), (1, 1))
+
+    def test_batch_failures_escalated(self):
+        """Test that batched inputs failing on the fast model go to the strong model"""
+        texts = ["明天上午10点开会", "meeting tomorrow 3pm"]
+
+        def responder(model, messages):
+            inputs = batch_inputs(messages)
+            if inputs:
+                return {"events": [echo_event(inputs[0]), {"summary": inputs[1]}]}
+            return echo_event(messages[1]['content'])
+
+        parser = self.make_parser(responder)
+        results = parser.parse_texts(texts)
+        self.assertEqual([result['summary'] for result in results], texts)
+        self.assertEqual([call['model'] for call in parser.client.calls], ['fast-model', 'strong-model'])
+        self.assertEqual(batch_inputs(parser.client.calls[1]['messages']), [])
+
+        stats = parser.routing_stats()
+        self.assertEqual((stats[FAST]['calls'], stats[FAST]['successes'], stats[FAST]['escalations']), (2, 1, 1))
+        self.assertEqual((stats[STRONG]['calls'], stats[STRONG]['successes']), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
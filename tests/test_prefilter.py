@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp.prefilter import score_text, is_event_text, load_corpus, evaluate
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'prefilter_corpus.tsv')
+
+class TestPrefilter(unittest.TestCase):
+    def test_precision_recall(self):
+        """Test precision and recall on the labelled corpus"""
+        # The corpus includes known misses, so these are regression floors
+        precision, recall, _ = evaluate(load_corpus(CORPUS_PATH))
+        self.assertGreaterEqual(precision, 0.95)
+        self.assertGreaterEqual(recall, 0.9)
+
+    def test_reasons(self):
+        """Test which signals are reported"""
+        self.assertEqual(score_text("明天下午3点开会").reasons, ['time', 'date', 'event'])
+        self.assertEqual(score_text("约你吃饭").reasons, ['event'])
+        self.assertFalse(score_text("约你吃饭").accepted)
+        self.assertFalse(score_text("tomorrow").accepted)
+
+    def test_english_weekdays(self):
+        """Test full weekday names and bare hours"""
+        for text in ["Saturday 3pm", "next wednesday team sync", "haircut on Saturday at 11",
+                     "Group meeting at 10", "Dinner with Alice at 7"]:
+            self.assertTrue(is_event_text(text), text)
+        self.assertFalse(is_event_text("I sat down and had a think"))
+
+    def test_mixed_script_boundaries(self):
+        """Test English tokens directly followed by Chinese characters"""
+        self.assertTrue(is_event_text("tomorrow 3pm开会"))
+        self.assertFalse(is_event_text("Pmall商城"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp.text_parser import TextParser, ParsingError
+from src.server import CalendarServer, MicroBatcher
+from tests.stub_client import StubClient, batch_inputs, echo_event
+
+TEXTS = ["明天上午10点开会", "下周二下午2点半在3楼会议室开项目进展会", "meeting tomorrow 3pm"]
+
+def make_parser(client: StubClient) -> TextParser:
+    parser = TextParser(api_key="sk-xxxxxxx", max_retries=0)
+    parser.client = client
+    return parser
+
+class TestParseTexts(unittest.TestCase):
+    def test_results_match_inputs(self):
+        """Test that one batched call answers every input in order"""
+        client = StubClient()
+        results = make_parser(client).parse_texts(TEXTS)
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual([result['summary'] for result in results], TEXTS)
+
+    def test_invalid_inputs_reported_in_place(self):
+        """Test that rejected inputs get their error without an API call"""
+        client = StubClient()
+        results = make_parser(client).parse_texts(["约你吃饭"] + TEXTS[:2])
+        self.assertIsInstance(results[0], ParsingError)
+        self.assertEqual([result['summary'] for result in results[1:]], TEXTS[:2])
+        self.assertEqual(batch_inputs(client.calls[0]['messages']), TEXTS[:2])
+
+    def test_length_mismatch_falls_back(self):
+        """Test that a batch answer of the wrong length is retried per input"""
+        def responder(model, messages):
+            inputs = batch_inputs(messages)
+            return {"events": [echo_event(inputs[0])]} if inputs else echo_event(messages[1]['content'])
+        client = StubClient(responder)
+        results = make_parser(client).parse_texts(TEXTS)
+        self.assertEqual([result['summary'] for result in results], TEXTS)
+        self.assertEqual(len(client.calls), 1 + len(TEXTS))
+
+    def test_invalid_item_retried(self):
+        """Test that only the invalid entries of a batch are retried"""
+        def responder(model, messages):
+            inputs = batch_inputs(messages)
+            if inputs:
+                return {"events": [echo_event(inputs[0]), "oops", {"summary": "no time"}]}
+            return echo_event(messages[1]['content'])
+        client = StubClient(responder)
+        results = make_parser(client).parse_texts(TEXTS)
+        self.assertEqual([result['summary'] for result in results], TEXTS)
+        self.assertEqual(len(client.calls), 3)
+
+    def test_single_input_not_batched(self):
+        """Test that a single input uses the regular prompt"""
+        client = StubClient()
+        make_parser(client).parse_texts(TEXTS[:1])
+        self.assertEqual(batch_inputs(client.calls[0]['messages']), [])
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_max_batch_size(self):
+        """Test that batches are split at max_batch_size"""
+        client = StubClient()
+        batcher = MicroBatcher(make_parser(client), window=0.5, max_batch_size=2)
+        futures = [batcher.submit(text) for text in TEXTS]
+        self.assertEqual([future.result(timeout=5)['summary'] for future in futures], TEXTS)
+        self.assertEqual(len(client.calls), 2)
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.client = StubClient()
+        parser = make_parser(self.client)
+        self.server = CalendarServer(('127.0.0.1', 0), parser, MicroBatcher(parser, window=0.3))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def post(self, path, body):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        request = urllib.request.Request(self.url + path, data=data, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, response.headers, response.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read().decode('utf-8')
+
+    def test_concurrent_requests_batched(self):
+        """Test that concurrent /parse requests share one API call"""
+        responses = [None] * len(TEXTS)
+
+        def send(index):
+            responses[index] = self.post('/parse', {"text": TEXTS[index]})
+
+        threads = [threading.Thread(target=send, args=(i,)) for i in range(len(TEXTS))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.client.calls), 1)
+        for text, (status, _, body) in zip(TEXTS, responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(json.loads(body)['summary'], text)
+
+    def test_error_statuses(self):
+        """Test 400, 404 and 422 responses"""
+        self.assertEqual(self.post('/parse', b'not json')[0], 400)
+        self.assertEqual(self.post('/parse', {"foo": 1})[0], 400)
+        self.assertEqual(self.post('/ics', {"texts": []})[0], 400)
+        self.assertEqual(self.post('/nope', {"text": TEXTS[0]})[0], 404)
+        status, _, body = self.post('/parse', {"text": "约你吃饭"})
+        self.assertEqual(status, 422)
+        self.assertIn('error', json.loads(body))
+        self.assertEqual(self.post('/ics', {"texts": ["约你吃饭"]})[0], 422)
+
+    def test_ics_streamed(self):
+        """Test chunked .ics output with failed inputs counted"""
+        status, headers, body = self.post('/ics', {"texts": TEXTS[:2] + ["约你吃饭"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        self.assertEqual(headers['X-Failed-Events'], '1')
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+
+if __name__ == '__main__':
+    unittest.main()